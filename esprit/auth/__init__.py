@@ -12,6 +12,7 @@ from esprit.auth.credentials import (
     clear_credentials,
     get_auth_token,
     get_credentials,
+    invalidate_subscription_cache,
     is_authenticated,
     save_credentials,
     verify_subscription,
@@ -24,4 +25,5 @@ __all__ = [
     "save_credentials",
     "clear_credentials",
     "verify_subscription",
+    "invalidate_subscription_cache",
 ]
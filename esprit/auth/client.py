@@ -6,14 +6,21 @@ Uses Device Authorization Flow (RFC 8628) for secure CLI authentication.
 
 from __future__ import annotations
 
+import base64
+import contextlib
+import json
 import os
+import random
+import signal
+import threading
 import time
-import webbrowser
+from concurrent.futures import ThreadPoolExecutor
+from collections.abc import Iterator
 from dataclasses import dataclass
-from datetime import timezone
 from typing import Any
 
 import requests
+from requests.adapters import HTTPAdapter
 
 from esprit.auth.credentials import Credentials, save_credentials
 
@@ -28,6 +35,38 @@ SUPABASE_ANON_KEY = os.getenv(
 # API URL for device flow endpoints
 API_BASE_URL = os.getenv("ESPRIT_API_URL", "https://esprit.dev/api/v1")
 
+# Device-flow polling cadence (RFC 8628 section 3.5)
+_POLL_INTERVAL_MARGIN = 1.2
+_SLOW_DOWN_FACTOR = 1.4
+_SLOW_DOWN_STEP_SECONDS = 5.0
+_POLL_JITTER_SECONDS = 0.2
+# Kept short so a Ctrl-C during an in-flight poll is honoured promptly
+_POLL_REQUEST_TIMEOUT_SECONDS = 10
+
+_TOKEN_AUTH_CACHE_SIZE = 8
+
+
+def _jwt_subject(token: str) -> str | None:
+    """Read the ``sub`` claim from a JWT without verifying it."""
+    try:
+        payload = token.split(".")[1]
+        claims = json.loads(base64.urlsafe_b64decode(payload + "=" * (-len(payload) % 4)))
+    except (IndexError, ValueError):
+        return None
+    subject = claims.get("sub") if isinstance(claims, dict) else None
+    return subject if isinstance(subject, str) and subject else None
+
+
+class _BearerAuth(requests.auth.AuthBase):
+    """Attach the Supabase headers with ``Authorization: Bearer <token>``."""
+
+    def __init__(self, token: str, headers: dict[str, str]) -> None:
+        self._headers = {**headers, "Authorization": f"Bearer {token}"}
+
+    def __call__(self, r: requests.PreparedRequest) -> requests.PreparedRequest:
+        r.headers.update(self._headers)
+        return r
+
 
 @dataclass
 class AuthResult:
@@ -55,6 +94,41 @@ class SupabaseAuthClient:
             "Authorization": f"Bearer {supabase_key}",
             "Content-Type": "application/json",
         }
+        # One pooled session per client so the device-flow poll loop and the
+        # follow-up profile lookups reuse keep-alive connections. The session
+        # carries no Supabase headers: self.headers is attached per request by
+        # the auth hook on Supabase calls only, never on the device-flow
+        # endpoints.
+        self._session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=4, pool_maxsize=8, max_retries=0)
+        self._session.mount("https://", adapter)
+        self._session.mount("http://", adapter)
+        self._token_auth_cache: dict[str, _BearerAuth] = {}
+        self._cancel = threading.Event()
+
+    def _auth(self, access_token: str) -> _BearerAuth:
+        """Supabase request auth hook for ``access_token``, built once per token."""
+        auth = self._token_auth_cache.get(access_token)
+        if auth is None:
+            if len(self._token_auth_cache) >= _TOKEN_AUTH_CACHE_SIZE:
+                self._token_auth_cache.pop(next(iter(self._token_auth_cache)))
+            auth = _BearerAuth(access_token, self.headers)
+            self._token_auth_cache[access_token] = auth
+        return auth
+
+    def cancel(self) -> None:
+        """Stop an in-progress device-flow poll at its next wait."""
+        self._cancel.set()
+
+    def close(self) -> None:
+        """Release pooled connections held by the client."""
+        self._session.close()
+
+    def __enter__(self) -> SupabaseAuthClient:
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.close()
 
     def login_with_device_flow(self) -> AuthResult:
         """
@@ -68,14 +142,20 @@ class SupabaseAuthClient:
         5. Save credentials locally
 
         No local server required - much more secure!
+
+        Ctrl-C while waiting cancels the login. It takes effect at once
+        between polls, or once an in-flight poll request returns (at most
+        ``_POLL_REQUEST_TIMEOUT_SECONDS``); pressing it twice aborts at once.
         """
+        import webbrowser
+
         from rich.console import Console
 
         console = Console()
 
         # Step 1: Request device code
         try:
-            response = requests.post(
+            response = self._session.post(
                 f"{self.api_base_url}/auth/device/code",
                 json={"client_id": "esprit-cli"},
                 timeout=30,
@@ -111,51 +191,108 @@ class SupabaseAuthClient:
         webbrowser.open(verification_uri_complete)
         console.print()
 
-        # Step 4: Poll for token
-        console.print("[dim]Waiting for authorization...[/]", end="")
+        # Step 4: Poll for token behind a single self-animating spinner.
+        self._cancel.clear()
+        with self._sigint_cancels(), console.status("[dim]Waiting for authorization...[/]"):
+            outcome = self._poll_device_token(device_code, expires_in, interval)
+
+        if isinstance(outcome, AuthResult):
+            console.print("[dim]Waiting for authorization...[/] [red]✗[/]")
+            return outcome
 
-        start_time = time.time()
-        while time.time() - start_time < expires_in:
-            time.sleep(interval)
+        console.print("[dim]Waiting for authorization...[/] [green]✓[/]")
+        return self._complete_device_login(outcome)
+
+    @contextlib.contextmanager
+    def _sigint_cancels(self) -> Iterator[None]:
+        """Route Ctrl-C to :meth:`cancel` while polling.
+
+        A first Ctrl-C ends the wait between polls at once; a poll request
+        already in flight is allowed to finish (at most
+        ``_POLL_REQUEST_TIMEOUT_SECONDS``). A second Ctrl-C raises
+        ``KeyboardInterrupt`` immediately. The previous handler is always
+        restored, including when it was not installed from Python.
+        """
+        if threading.current_thread() is not threading.main_thread():
+            yield
+            return
+
+        def on_sigint(signum: int, frame: object) -> None:
+            if self._cancel.is_set():
+                raise KeyboardInterrupt
+            self._cancel.set()
+
+        previous_handler = signal.signal(signal.SIGINT, on_sigint)
+        try:
+            yield
+        finally:
+            # signal.signal() reports a handler installed outside Python as
+            # None, which cannot be passed back; fall back to the default.
+            signal.signal(
+                signal.SIGINT,
+                previous_handler if previous_handler is not None else signal.default_int_handler,
+            )
+
+    def _poll_device_token(
+        self,
+        device_code: str,
+        expires_in: float,
+        interval: float,
+    ) -> dict[str, Any] | AuthResult:
+        """Poll the token endpoint until it yields token data or a terminal error."""
+        # Track the deadline on the monotonic clock so NTP jumps or suspend
+        # cannot stretch the loop, with a wall-clock backstop for skew.
+        deadline = time.monotonic() + expires_in
+        wall_deadline = time.time() + expires_in
+        current_interval = interval * _POLL_INTERVAL_MARGIN
+        slow_down_seen = False
+        while time.monotonic() < deadline and time.time() < wall_deadline:
+            jitter = random.uniform(-_POLL_JITTER_SECONDS, _POLL_JITTER_SECONDS)  # noqa: S311
+            if self._cancel.wait(max(0.0, current_interval + jitter)):
+                return AuthResult(success=False, error="Cancelled")
 
             try:
-                token_response = requests.post(
+                token_response = self._session.post(
                     f"{self.api_base_url}/auth/device/token",
                     json={
                         "device_code": device_code,
                         "grant_type": "urn:ietf:params:oauth:grant-type:device_code",
                     },
-                    timeout=30,
+                    timeout=_POLL_REQUEST_TIMEOUT_SECONDS,
                 )
+                if self._cancel.is_set():
+                    return AuthResult(success=False, error="Cancelled")
 
                 if token_response.status_code == 200:
                     # Success!
-                    token_data = token_response.json()
-                    console.print(" [green]✓[/]")
-                    return self._complete_device_login(token_data)
+                    token_data: dict[str, Any] = token_response.json()
+                    return token_data
 
                 # Check error type
                 if token_response.status_code == 400:
-                    error_data = token_response.json()
-                    error = error_data.get("detail", {})
-
-                    if isinstance(error, dict):
-                        error_code = error.get("error", "")
+                    detail = token_response.json().get("detail")
+                    if isinstance(detail, dict):
+                        error_code = str(detail.get("error", ""))
                     else:
-                        error_code = str(error)
+                        error_code = str(detail or "")
 
-                    if "authorization_pending" in error_code:
-                        # Still waiting - print dot and continue
-                        console.print(".", end="")
+                    if error_code == "authorization_pending":
+                        # Still waiting
                         continue
-                    elif "expired_token" in error_code:
-                        console.print()
+                    elif error_code == "slow_down":
+                        # Back off harder the first time, then by the RFC step
+                        if not slow_down_seen:
+                            current_interval *= _SLOW_DOWN_FACTOR
+                            slow_down_seen = True
+                        else:
+                            current_interval += _SLOW_DOWN_STEP_SECONDS
+                        continue
+                    elif error_code == "expired_token":
                         return AuthResult(
                             success=False,
                             error="Code expired. Please try again.",
                         )
                     else:
-                        console.print()
                         return AuthResult(
                             success=False,
                             error=f"Authorization failed: {error_code}",
@@ -163,10 +300,8 @@ class SupabaseAuthClient:
 
             except requests.RequestException:
                 # Network error during polling - continue trying
-                console.print(".", end="")
                 continue
 
-        console.print()
         return AuthResult(success=False, error="Authorization timed out. Please try again.")
 
     def _complete_device_login(self, token_data: dict[str, Any]) -> AuthResult:
@@ -205,9 +340,9 @@ class SupabaseAuthClient:
         url = f"{self.supabase_url}/auth/v1/token?grant_type=password"
 
         try:
-            response = requests.post(
+            response = self._session.post(
                 url,
-                headers=self.headers,
+                auth=self._auth(self.supabase_key),
                 json={"email": email, "password": password},
                 timeout=30,
             )
@@ -231,14 +366,25 @@ class SupabaseAuthClient:
         refresh_token: str | None = None,
     ) -> AuthResult:
         """Complete login by fetching user info and saving credentials."""
-        # Get user info
-        user_info = self._get_user_info(access_token)
+        # The access token's subject is the user id, which lets the profile
+        # lookup run concurrently with the user-info request.
+        token_user_id = _jwt_subject(access_token)
+        with ThreadPoolExecutor(max_workers=2) as pool:
+            user_info_future = pool.submit(self._get_user_info, access_token)
+            profile_future = (
+                pool.submit(self._get_user_profile, access_token, token_user_id)
+                if token_user_id
+                else None
+            )
+            user_info = user_info_future.result()
+            profile = profile_future.result() if profile_future else None
 
         if not user_info:
             return AuthResult(success=False, error="Failed to get user info")
 
-        # Get profile info (plan, etc.)
-        profile = self._get_user_profile(access_token, user_info["id"])
+        # Get profile info (plan, etc.) if the token did not name this user
+        if user_info["id"] != token_user_id:
+            profile = self._get_user_profile(access_token, user_info["id"])
 
         credentials: Credentials = {
             "access_token": access_token,
@@ -257,13 +403,9 @@ class SupabaseAuthClient:
     def _get_user_info(self, access_token: str) -> dict[str, Any] | None:
         """Get user info from Supabase."""
         url = f"{self.supabase_url}/auth/v1/user"
-        headers = {
-            **self.headers,
-            "Authorization": f"Bearer {access_token}",
-        }
 
         try:
-            response = requests.get(url, headers=headers, timeout=30)
+            response = self._session.get(url, auth=self._auth(access_token), timeout=30)
             if response.status_code == 200:
                 return response.json()
         except requests.RequestException:
@@ -278,13 +420,9 @@ class SupabaseAuthClient:
     ) -> dict[str, Any] | None:
         """Get user profile from profiles table."""
         url = f"{self.supabase_url}/rest/v1/profiles?id=eq.{user_id}&select=*"
-        headers = {
-            **self.headers,
-            "Authorization": f"Bearer {access_token}",
-        }
 
         try:
-            response = requests.get(url, headers=headers, timeout=30)
+            response = self._session.get(url, auth=self._auth(access_token), timeout=30)
             if response.status_code == 200:
                 data = response.json()
                 return data[0] if data else None
@@ -295,21 +433,15 @@ class SupabaseAuthClient:
 
     def get_usage(self, access_token: str, user_id: str) -> dict[str, Any] | None:
         """Get user's current usage stats."""
-        from datetime import datetime
-
-        current_month = datetime.now(tz=timezone.utc).strftime("%Y-%m")
+        current_month = time.strftime("%Y-%m", time.gmtime())
 
         url = (
             f"{self.supabase_url}/rest/v1/usage?"
             f"user_id=eq.{user_id}&month=eq.{current_month}&select=*"
         )
-        headers = {
-            **self.headers,
-            "Authorization": f"Bearer {access_token}",
-        }
 
         try:
-            response = requests.get(url, headers=headers, timeout=30)
+            response = self._session.get(url, auth=self._auth(access_token), timeout=30)
             if response.status_code == 200:
                 data = response.json()
                 return data[0] if data else {"scans_count": 0, "tokens_used": 0}
@@ -6,24 +6,44 @@ Stores credentials in ~/.esprit/credentials.json
 
 from __future__ import annotations
 
+import contextlib
 import json
+import logging
 import os
+import tempfile
+import threading
 import time
-from datetime import datetime, timezone
 from pathlib import Path
-from typing import Any, TypedDict
+from typing import TYPE_CHECKING, Any, TypedDict
 
-import requests
+from esprit.utils import json_io
 
 
+if TYPE_CHECKING:
+    import requests
+
+
+logger = logging.getLogger(__name__)
+
 API_BASE_URL = os.getenv("ESPRIT_API_URL", "https://esprit.dev/api/v1").rstrip("/")
 _VERIFICATION_CACHE_TTL_SECONDS = 300
+# Past this age a cached verification is still served, but refreshed in the background
+_VERIFICATION_SOFT_TTL_SECONDS = _VERIFICATION_CACHE_TTL_SECONDS * 0.8
 _PAID_PLANS = {"pro", "team", "enterprise"}
 _verification_cache: dict[str, Any] = {
     "token": None,
     "checked_at": 0.0,
     "result": None,
+    "refreshing": False,
 }
+_verification_lock = threading.Lock()
+# Created on first verification; requests is imported lazily so that
+# auth status checks at CLI startup do not pay for it.
+_SESSION: requests.Session | None = None
+# ~/.esprit directory already created by this process
+_ESPRIT_DIR: Path | None = None
+# (path, st_mtime_ns, st_size, parsed credentials) of the last read
+_CREDS_CACHE: tuple[str, int, int, Credentials | None] | None = None
 
 
 class Credentials(TypedDict, total=False):
@@ -49,81 +69,126 @@ class SubscriptionVerification(TypedDict, total=False):
 
 def get_credentials_path() -> Path:
     """Get the path to the credentials file."""
+    global _ESPRIT_DIR  # noqa: PLW0603
     esprit_dir = Path.home() / ".esprit"
-    esprit_dir.mkdir(parents=True, exist_ok=True)
+    if esprit_dir != _ESPRIT_DIR:
+        # Only hit the filesystem the first time we see this directory
+        esprit_dir.mkdir(parents=True, exist_ok=True)
+        _ESPRIT_DIR = esprit_dir
     return esprit_dir / "credentials.json"
 
 
-def get_credentials() -> Credentials | None:
-    """Load credentials from disk."""
+def _load_credentials_cached() -> Credentials | None:
+    """Return the parsed credentials file, re-reading it only when it changed.
+
+    The result is shared between callers and must not be mutated; use
+    ``get_credentials()`` for a private copy.
+    """
+    global _CREDS_CACHE  # noqa: PLW0603
     creds_path = get_credentials_path()
 
-    if not creds_path.exists():
+    try:
+        st = os.stat(creds_path)
+    except FileNotFoundError:
+        _CREDS_CACHE = None
+        return None
+    except OSError:
         return None
 
+    key = str(creds_path)
+    cached = _CREDS_CACHE
+    if (
+        cached is not None
+        and cached[0] == key
+        and cached[1] == st.st_mtime_ns
+        and cached[2] == st.st_size
+    ):
+        return cached[3]
+
     try:
-        with creds_path.open(encoding="utf-8") as f:
-            return json.load(f)
+        creds: Credentials | None = json_io.loads(creds_path.read_bytes())
     except (json.JSONDecodeError, OSError):
-        return None
+        creds = None
+
+    _CREDS_CACHE = (key, st.st_mtime_ns, st.st_size, creds)
+    return creds
+
+
+def get_credentials() -> Credentials | None:
+    """Load credentials from disk.
+
+    The parsed file is cached per process and reused while its mtime and
+    size are unchanged, so repeated auth checks do not re-read the JSON.
+    """
+    creds = _load_credentials_cached()
+    return creds.copy() if creds is not None else None
 
 
 def save_credentials(credentials: Credentials) -> None:
     """Save credentials to disk."""
+    global _CREDS_CACHE  # noqa: PLW0603
     creds_path = get_credentials_path()
+    _CREDS_CACHE = None
 
-    # Ensure parent directory exists
+    # Ensure parent directory exists (it may have been removed since first use)
     creds_path.parent.mkdir(parents=True, exist_ok=True)
 
-    # Write credentials with restricted permissions
-    with creds_path.open("w", encoding="utf-8") as f:
-        json.dump(credentials, f, indent=2)
+    if _verification_cache.get("token") not in (None, credentials.get("access_token")):
+        invalidate_subscription_cache()
 
-    # Set file permissions to owner-only (Unix)
-    if os.name != "nt":
-        os.chmod(creds_path, 0o600)
+    # Replace the file a symlinked credentials.json points at, not the link
+    target = creds_path.resolve()
+    # Atomic write: mkstemp creates the file owner-only (0o600) and the
+    # rename means readers never observe a half-written credentials file
+    fd, tmp_path = tempfile.mkstemp(
+        dir=str(target.parent), suffix=".tmp", prefix="credentials_"
+    )
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(json_io.dumps_pretty(credentials))
+        os.replace(tmp_path, target)
+    except BaseException:
+        with contextlib.suppress(OSError):
+            os.unlink(tmp_path)
+        raise
 
 
 def clear_credentials() -> None:
     """Remove stored credentials."""
+    global _CREDS_CACHE  # noqa: PLW0603
     creds_path = get_credentials_path()
+    _CREDS_CACHE = None
+    invalidate_subscription_cache()
 
     if creds_path.exists():
         creds_path.unlink()
 
 
-def is_authenticated() -> bool:
-    """Check if user is authenticated with valid credentials."""
-    creds = get_credentials()
-
-    if not creds:
+def _has_valid_token(creds: Credentials | None) -> bool:
+    if not creds or "access_token" not in creds:
         return False
 
-    if "access_token" not in creds:
-        return False
-
-    # Check if token has expired
+    # expires_at is stored as Unix seconds, so compare against the epoch directly
     expires_at = creds.get("expires_at")
-    if expires_at:
-        now = int(datetime.now(tz=timezone.utc).timestamp())
-        if now >= expires_at:
-            return False
+    return not (expires_at and time.time() >= expires_at)
+
 
-    return True
+def is_authenticated() -> bool:
+    """Check if user is authenticated with valid credentials."""
+    return _has_valid_token(_load_credentials_cached())
 
 
 def get_auth_token() -> str | None:
     """Get the current access token if authenticated."""
-    if not is_authenticated():
+    creds = _load_credentials_cached()
+    if not _has_valid_token(creds):
         return None
-
-    creds = get_credentials()
     return creds.get("access_token") if creds else None
 
 
 def get_user_plan() -> str:
     """Get the current user's plan."""
-    creds = get_credentials()
+    creds = _load_credentials_cached()
     if creds:
         return creds.get("plan", "free")
     return "free"
@@ -131,44 +196,42 @@ def get_user_plan() -> str:
 
 def get_user_email() -> str | None:
     """Get the current user's email."""
-    creds = get_credentials()
+    creds = _load_credentials_cached()
     return creds.get("email") if creds else None
 
 
 def get_user_id() -> str | None:
     """Get the current user's ID."""
-    creds = get_credentials()
+    creds = _load_credentials_cached()
     return creds.get("user_id") if creds else None
 
 
-def verify_subscription(
-    access_token: str | None = None,
-    *,
-    force_refresh: bool = False,
-) -> SubscriptionVerification:
-    """Verify subscription status with the Esprit API."""
-    token = access_token or get_auth_token()
-    if not token:
-        return {
-            "valid": False,
-            "plan": "free",
-            "quota_remaining": {"scans": 0, "tokens": 0},
-            "cloud_enabled": False,
-            "available_models": [],
-            "error": "No authentication token available.",
-        }
+def invalidate_subscription_cache(token: str | None = None) -> None:
+    """Drop the cached subscription verification.
+
+    When ``token`` is given, the cache is only cleared if it belongs to that token.
+    """
+    with _verification_lock:
+        if token is not None and _verification_cache.get("token") != token:
+            return
+        _verification_cache["token"] = None
+        _verification_cache["checked_at"] = 0.0
+        _verification_cache["result"] = None
+        _verification_cache["refreshing"] = False
+
+
+def _get_session() -> requests.Session:
+    global _SESSION  # noqa: PLW0603
+    if _SESSION is None:
+        import requests
+
+        _SESSION = requests.Session()
+    return _SESSION
 
-    now = time.time()
-    cached_token = _verification_cache.get("token")
-    cached_checked_at = float(_verification_cache.get("checked_at") or 0.0)
-    cached_result = _verification_cache.get("result")
-    if (
-        not force_refresh
-        and cached_token == token
-        and cached_result is not None
-        and now - cached_checked_at < _VERIFICATION_CACHE_TTL_SECONDS
-    ):
-        return cached_result
+
+def _fetch_subscription(token: str) -> SubscriptionVerification:
+    """Query the subscription API for ``token``."""
+    import requests
 
     headers = {"Authorization": f"Bearer {token}"}
     default_result: SubscriptionVerification = {
@@ -180,7 +243,7 @@ def verify_subscription(
     }
 
     try:
-        response = requests.get(
+        response = _get_session().get(
             f"{API_BASE_URL}/subscription/verify",
             headers=headers,
             timeout=15,
@@ -206,7 +269,73 @@ def verify_subscription(
         result = dict(default_result)
         result["error"] = f"Subscription verification failed: {exc}"
 
-    _verification_cache["token"] = token
-    _verification_cache["checked_at"] = now
-    _verification_cache["result"] = result
+    return result
+
+
+def _refresh_subscription(token: str) -> None:
+    """Background worker that renews a soon-to-expire cached verification."""
+    checked_at = time.time()
+    result: SubscriptionVerification | None = None
+    try:
+        result = _fetch_subscription(token)
+    except Exception:
+        # Keep serving the cached entry; a later call retries the refresh
+        logger.debug("Background subscription refresh failed", exc_info=True)
+    finally:
+        with _verification_lock:
+            if result is not None and _verification_cache.get("token") == token:
+                _verification_cache["checked_at"] = checked_at
+                _verification_cache["result"] = result
+            _verification_cache["refreshing"] = False
+
+
+def verify_subscription(
+    access_token: str | None = None,
+    *,
+    force_refresh: bool = False,
+) -> SubscriptionVerification:
+    """Verify subscription status with the Esprit API.
+
+    Results are cached for five minutes. Once an entry passes 80% of that
+    window it is still returned immediately while a daemon thread renews it,
+    so only a cold or fully expired cache blocks on the network.
+    """
+    token = access_token or get_auth_token()
+    if not token:
+        return {
+            "valid": False,
+            "plan": "free",
+            "quota_remaining": {"scans": 0, "tokens": 0},
+            "cloud_enabled": False,
+            "available_models": [],
+            "error": "No authentication token available.",
+        }
+
+    now = time.time()
+    cached_result: SubscriptionVerification | None = None
+    start_refresh = False
+    with _verification_lock:
+        age = now - float(_verification_cache.get("checked_at") or 0.0)
+        if (
+            not force_refresh
+            and _verification_cache.get("token") == token
+            and _verification_cache.get("result") is not None
+            and age < _VERIFICATION_CACHE_TTL_SECONDS
+        ):
+            cached_result = _verification_cache["result"]
+            if age >= _VERIFICATION_SOFT_TTL_SECONDS and not _verification_cache["refreshing"]:
+                _verification_cache["refreshing"] = True
+                start_refresh = True
+
+    if cached_result is not None:
+        if start_refresh:
+            threading.Thread(target=_refresh_subscription, args=(token,), daemon=True).start()
+        return cached_result
+
+    result = _fetch_subscription(token)
+
+    with _verification_lock:
+        _verification_cache["token"] = token
+        _verification_cache["checked_at"] = now
+        _verification_cache["result"] = result
     return result
@@ -1,9 +1,13 @@
 import contextlib
+import copy
 import json
 import os
+import tempfile
 from pathlib import Path
 from typing import Any
 
+from esprit.utils import json_io
+
 
 class Config:
     """Configuration Manager for Esprit."""
@@ -58,31 +62,42 @@ class Config:
     _DEFAULT_RUNTIME_PROFILE = "cloud"
     _RUNTIME_PROFILES = {"cloud", "connectors"}
 
+    # Filled in once after the class body; see bottom of the class definition.
+    _TRACKED_NAMES: tuple[str, ...] = ()
+    _TRACKED_UPPER: tuple[str, ...] = ()
+    _TRACKED_UPPER_SET: frozenset[str] = frozenset()
+    _LLM_ENV_VARS: frozenset[str] = frozenset()
+    # (path, st_mtime_ns, st_size, parsed config, raw bytes) of the last load()/save()
+    _LOADED_CACHE: tuple[str, int, int, dict[str, Any], bytes] | None = None
+
     @classmethod
-    def _tracked_names(cls) -> list[str]:
-        return [
+    def _scan_tracked_names(cls) -> tuple[str, ...]:
+        return tuple(
             k
             for k, v in vars(cls).items()
             if not k.startswith("_") and k[0].islower() and (v is None or isinstance(v, str))
-        ]
+        )
+
+    @classmethod
+    def _tracked_names(cls) -> list[str]:
+        return list(cls._TRACKED_NAMES)
 
     @classmethod
     def tracked_vars(cls) -> list[str]:
-        return [name.upper() for name in cls._tracked_names()]
+        return list(cls._TRACKED_UPPER)
 
     @classmethod
-    def _llm_env_vars(cls) -> set[str]:
-        return {name.upper() for name in cls._LLM_CANONICAL_NAMES}
+    def _llm_env_vars(cls) -> frozenset[str]:
+        return cls._LLM_ENV_VARS
 
     @classmethod
     def _llm_env_changed(cls, saved_env: dict[str, Any]) -> bool:
-        for var_name in cls._llm_env_vars():
-            current = os.getenv(var_name)
-            if current is None:
-                continue
-            if saved_env.get(var_name) != current:
-                return True
-        return False
+        # Only LLM vars actually present in the environment can differ
+        environ = os.environ
+        return any(
+            saved_env.get(var_name) != environ[var_name]
+            for var_name in cls._llm_env_vars().intersection(environ)
+        )
 
     @classmethod
     def get(cls, name: str) -> str | None:
@@ -101,28 +116,88 @@ class Config:
         return cls.config_dir() / "cli-config.json"
 
     @classmethod
-    def load(cls) -> dict[str, Any]:
+    def invalidate_cache(cls) -> None:
+        """Forget the parsed config so the next load() re-reads the file."""
+        cls._LOADED_CACHE = None
+
+    @classmethod
+    def _load_shared(cls) -> dict[str, Any]:
+        """Parsed config shared with the cache; callers must not mutate it.
+
+        A missing file costs a single failed stat and no parsing.
+        """
         path = cls.config_file()
-        if not path.exists():
+        try:
+            st = path.stat()
+        except OSError:
             return {}
+        key = str(path)
+        cached = cls._LOADED_CACHE
+        if cached is not None and cached[:3] == (key, st.st_mtime_ns, st.st_size):
+            return cached[3]
         try:
-            with path.open("r", encoding="utf-8") as f:
-                data: dict[str, Any] = json.load(f)
-                return data
+            raw = path.read_bytes()
+            data: dict[str, Any] = json_io.loads(raw)
         except (json.JSONDecodeError, OSError):
             return {}
+        if isinstance(data, dict):
+            cls._LOADED_CACHE = (key, st.st_mtime_ns, st.st_size, data, raw)
+        return data
+
+    @classmethod
+    def load(cls) -> dict[str, Any]:
+        # Callers mutate the result before saving, so hand out a copy
+        return copy.deepcopy(cls._load_shared())
+
+    @classmethod
+    def _unchanged_on_disk(cls, config_path: Path, payload: bytes) -> bool:
+        cached = cls._LOADED_CACHE
+        if cached is None or cached[0] != str(config_path) or cached[4] != payload:
+            return False
+        try:
+            st = config_path.stat()
+        except OSError:
+            return False
+        return (st.st_mtime_ns, st.st_size) == cached[1:3]
 
     @classmethod
     def save(cls, config: dict[str, Any]) -> bool:
+        config_dir = cls.config_dir()
+        config_path = config_dir / "cli-config.json"
+        payload = json_io.dumps_pretty(config)
+        if cls._unchanged_on_disk(config_path, payload):
+            return True
+
+        cls.invalidate_cache()
         try:
-            cls.config_dir().mkdir(parents=True, exist_ok=True)
-            config_path = cls.config_dir() / "cli-config.json"
-            with config_path.open("w", encoding="utf-8") as f:
-                json.dump(config, f, indent=2)
+            config_dir.mkdir(parents=True, exist_ok=True)
+            # Replace the file a symlinked config points at, not the link itself
+            target = config_path.resolve()
+            # Atomic write: mkstemp creates the temp file owner-only (0o600),
+            # so no separate chmod is needed after the rename
+            fd, tmp_path = tempfile.mkstemp(
+                dir=str(target.parent), suffix=".tmp", prefix="cli-config_"
+            )
         except OSError:
             return False
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(payload)
+            os.replace(tmp_path, target)
+        except OSError:
+            with contextlib.suppress(OSError):
+                os.unlink(tmp_path)
+            return False
+        # Seed the cache with what was just written so the next load() is free
         with contextlib.suppress(OSError):
-            config_path.chmod(0o600)  # may fail on Windows
+            st = config_path.stat()
+            cls._LOADED_CACHE = (
+                str(config_path),
+                st.st_mtime_ns,
+                st.st_size,
+                copy.deepcopy(config),
+                payload,
+            )
         return True
 
     @classmethod
@@ -133,37 +208,39 @@ class Config:
         env_vars = saved.get("env", {})
         if not isinstance(env_vars, dict):
             env_vars = {}
-        cleared_vars = {
-            var_name
-            for var_name in cls.tracked_vars()
-            if var_name in os.environ and os.environ.get(var_name) == ""
-        }
-        if cleared_vars:
-            for var_name in cleared_vars:
-                env_vars.pop(var_name, None)
-            if cls._config_file_override is None:
-                saved["env"] = env_vars
-                cls.save(saved)
+        if not env_vars:
+            return {}
+
+        # Drop saved values the user cleared (set to "") or whose LLM settings
+        # changed in the environment, then write back at most once.
+        environ = os.environ
+        dirty = False
+        for var_name in cls._TRACKED_UPPER_SET.intersection(environ):
+            if environ[var_name] == "" and var_name in env_vars:
+                del env_vars[var_name]
+                dirty = True
         if cls._llm_env_changed(env_vars):
-            for var_name in cls._llm_env_vars():
-                env_vars.pop(var_name, None)
-            if cls._config_file_override is None:
-                saved["env"] = env_vars
-                cls.save(saved)
+            for var_name in cls._llm_env_vars().intersection(env_vars):
+                del env_vars[var_name]
+                dirty = True
+        if dirty and cls._config_file_override is None:
+            saved["env"] = env_vars
+            cls.save(saved)
         applied = {}
 
         for var_name, var_value in env_vars.items():
-            if var_name in cls.tracked_vars() and (force or var_name not in os.environ):
-                os.environ[var_name] = var_value
+            if var_name in cls._TRACKED_UPPER_SET and (force or var_name not in environ):
+                environ[var_name] = var_value
                 applied[var_name] = var_value
 
         return applied
 
     @classmethod
     def capture_current(cls) -> dict[str, Any]:
+        environ = os.environ
         env_vars = {}
-        for var_name in cls.tracked_vars():
-            value = os.getenv(var_name)
+        for var_name in cls._TRACKED_UPPER:
+            value = environ.get(var_name)
             if value:
                 env_vars[var_name] = value
         return {"env": env_vars}
@@ -178,8 +255,9 @@ class Config:
             existing = {}
         merged = dict(existing)
 
-        for var_name in cls.tracked_vars():
-            value = os.getenv(var_name)
+        environ = os.environ
+        for var_name in cls._TRACKED_UPPER:
+            value = environ.get(var_name)
             if value is None:
                 pass
             elif value == "":
@@ -187,12 +265,15 @@ class Config:
             else:
                 merged[var_name] = value
 
+        if merged == existing and "env" in saved:
+            # Nothing to persist; skip serializing and rewriting the file
+            return True
         saved["env"] = merged
         return cls.save(saved)
 
     @classmethod
     def get_launchpad_theme(cls) -> str:
-        saved = cls.load()
+        saved = cls._load_shared()
         if not isinstance(saved, dict):
             return cls._DEFAULT_LAUNCHPAD_THEME
         ui = saved.get(cls._UI_SECTION_KEY, {})
@@ -219,7 +300,7 @@ class Config:
 
     @classmethod
     def get_runtime_profile(cls) -> str:
-        saved = cls.load()
+        saved = cls._load_shared()
         if isinstance(saved, dict):
             ui = saved.get(cls._UI_SECTION_KEY, {})
             if isinstance(ui, dict):
@@ -252,6 +333,14 @@ class Config:
         return cls.save(saved)
 
 
+# The tracked attribute set is fixed at class definition, so scan it once
+# instead of walking vars(Config) on every apply/capture/save.
+Config._TRACKED_NAMES = Config._scan_tracked_names()
+Config._TRACKED_UPPER = tuple(name.upper() for name in Config._TRACKED_NAMES)
+Config._TRACKED_UPPER_SET = frozenset(Config._TRACKED_UPPER)
+Config._LLM_ENV_VARS = frozenset(name.upper() for name in Config._LLM_CANONICAL_NAMES)
+
+
 def apply_saved_config(force: bool = False) -> dict[str, str]:
     return Config.apply_saved(force=force)
 
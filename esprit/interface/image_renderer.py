@@ -13,18 +13,26 @@ rendering pipeline.  It auto-selects the best available renderer.
 
 from __future__ import annotations
 
-import base64
 import io
 import logging
 import os
 from collections.abc import Mapping
+from functools import lru_cache
+from itertools import groupby
+from operator import itemgetter
 
 from rich.console import Group
 from rich.style import Style
-from rich.text import Text
+from rich.text import Span, Text
 
 from esprit.interface.theme_tokens import get_marker_color
 
+try:
+    # SIMD base64 decoder; same call signature and output as the stdlib one
+    from pybase64 import b64decode as _b64decode
+except ImportError:
+    from base64 import b64decode as _b64decode
+
 logger = logging.getLogger(__name__)
 
 _PILLOW_AVAILABLE: bool | None = None
@@ -53,30 +61,57 @@ _QUARTER_BLOCKS: list[str] = [
     "█",  # 0b1111
 ]
 
-# Pre-computed masks: for each of the 16 block chars, which of the 4 pixel
-# positions belong to the foreground.  Index order: (TL, TR, BL, BR).
-_QUARTER_MASKS: list[tuple[bool, bool, bool, bool]] = [
-    tuple(bool(i & (1 << (3 - b))) for b in range(4))  # type: ignore[misc]
+# Pre-computed partitions: for each of the 16 block chars, the pixel
+# positions (0=TL, 1=TR, 2=BL, 3=BR) in the foreground and in the background.
+_QUARTER_PARTITIONS: list[tuple[tuple[int, ...], tuple[int, ...]]] = [
+    (
+        tuple(j for j in range(4) if i & (1 << (3 - j))),
+        tuple(j for j in range(4) if not i & (1 << (3 - j))),
+    )
     for i in range(16)
 ]
 
 
+@lru_cache(maxsize=4096)
+def _rgb_hex(rgb: tuple[int, int, int]) -> str:
+    """Format an RGB triple as ``#rrggbb``.
+
+    Screenshots reuse a small palette across thousands of cells, so the
+    formatted strings are memoized rather than rebuilt per cell.
+    """
+    return f"#{rgb[0]:02x}{rgb[1]:02x}{rgb[2]:02x}"
+
+
+@lru_cache(maxsize=4096)
+def _cell_style(fg_hex: str, bg_hex: str) -> Style:
+    """Shared (immutable) Rich style for a fg/bg colour pair."""
+    return Style(color=fg_hex, bgcolor=bg_hex)
+
+
 def _avg_color(pixels: list[tuple[int, int, int]]) -> tuple[int, int, int]:
     """Return the average RGB color of *pixels*."""
     n = len(pixels)
     if n == 0:
         return (0, 0, 0)
-    r = sum(p[0] for p in pixels) // n
-    g = sum(p[1] for p in pixels) // n
-    b = sum(p[2] for p in pixels) // n
-    return (r, g, b)
+    # One fused pass; three generator-fed sum() calls cost ~4x more here
+    r = g = b = 0
+    for pr, pg, pb in pixels:
+        r += pr
+        g += pg
+        b += pb
+    return (r // n, g // n, b // n)
 
 
 def _color_dist_sq(
     a: tuple[int, int, int], b: tuple[int, int, int]
 ) -> int:
     """Squared Euclidean distance between two RGB colors."""
-    return (a[0] - b[0]) ** 2 + (a[1] - b[1]) ** 2 + (a[2] - b[2]) ** 2
+    # Explicit d*d: ``** 2`` goes through the generic power slot and is
+    # measurably slower in this hot loop.
+    dr = a[0] - b[0]
+    dg = a[1] - b[1]
+    db = a[2] - b[2]
+    return dr * dr + dg * dg + db * db
 
 
 def _best_quarter_block(
@@ -93,26 +128,47 @@ def _best_quarter_block(
 
     # Fast path: all four pixels identical → space with bg color
     if tl == tr == bl == br:
-        h = f"#{tl[0]:02x}{tl[1]:02x}{tl[2]:02x}"
+        h = _rgb_hex(tl)
         return (" ", h, h)
 
+    # Two-tone fast path (text on a flat background, panel edges): the exact
+    # split is "matches TL" vs "the other colour", so no search is needed.
+    # TL stays background, which is the mask the full search would pick.
+    other: tuple[int, int, int] | None = None
+    bits = 0
+    for j in (1, 2, 3):
+        px = quad[j]
+        if px == tl:
+            continue
+        if other is None:
+            other = px
+        elif px != other:
+            break
+        bits |= 1 << (3 - j)
+    else:
+        if other is not None:
+            return (_QUARTER_BLOCKS[bits], _rgb_hex(other), _rgb_hex(tl))
+
     best_err = float("inf")
     best_char = " "
     best_fg: tuple[int, int, int] = (0, 0, 0)
     best_bg: tuple[int, int, int] = (0, 0, 0)
 
-    for idx in range(16):
-        mask = _QUARTER_MASKS[idx]
-        fg_pixels = [quad[j] for j in range(4) if mask[j]]
-        bg_pixels = [quad[j] for j in range(4) if not mask[j]]
+    # Mask ``15 - idx`` is the complement of ``idx``: same partition with fg
+    # and bg swapped, hence the same error.  Ties keep the earlier index, so
+    # the winner always lies in 0..7 and the other half need not be tried.
+    for idx in range(8):
+        fg_idx, bg_idx = _QUARTER_PARTITIONS[idx]
+        fg_pixels = [quad[j] for j in fg_idx]
+        bg_pixels = [quad[j] for j in bg_idx]
 
         fg_c = _avg_color(fg_pixels) if fg_pixels else (0, 0, 0)
         bg_c = _avg_color(bg_pixels) if bg_pixels else (0, 0, 0)
 
         err = 0
-        for j in range(4):
-            ref = fg_c if mask[j] else bg_c
-            err += _color_dist_sq(quad[j], ref)
+        for pixels, ref in ((fg_pixels, fg_c), (bg_pixels, bg_c)):
+            for px in pixels:
+                err += _color_dist_sq(px, ref)
             if err >= best_err:
                 break
         else:
@@ -124,9 +180,52 @@ def _best_quarter_block(
             if err == 0:
                 break
 
-    fg_hex = f"#{best_fg[0]:02x}{best_fg[1]:02x}{best_fg[2]:02x}"
-    bg_hex = f"#{best_bg[0]:02x}{best_bg[1]:02x}{best_bg[2]:02x}"
-    return (best_char, fg_hex, bg_hex)
+    return (best_char, _rgb_hex(best_fg), _rgb_hex(best_bg))
+
+
+class _BlockCanvas:
+    """Collects a preview as string chunks plus a flat span list.
+
+    ``Text.append`` re-sanitizes and re-measures every segment it is given.
+    The preview body only contains glyphs generated here, so it is assembled
+    into a single string and turned into one ``Text`` at the end.
+    """
+
+    __slots__ = ("_parts", "_pos", "_spans")
+
+    def __init__(self) -> None:
+        self._parts: list[str] = []
+        self._spans: list[Span] = []
+        self._pos = 0
+
+    def write(self, chunk: str, style: Style | None = None) -> None:
+        end = self._pos + len(chunk)
+        if style is not None:
+            self._spans.append(Span(self._pos, end, style))
+        self._parts.append(chunk)
+        self._pos = end
+
+    def write_text(self, text: Text) -> None:
+        offset = self._pos
+        self._spans.extend(
+            Span(offset + span.start, offset + span.end, span.style) for span in text.spans
+        )
+        self._parts.append(text.plain)
+        self._pos += len(text.plain)
+
+    def to_text(self) -> Text:
+        return Text("".join(self._parts), spans=self._spans)
+
+
+def _write_runs(canvas: _BlockCanvas, cells: list[tuple[str, str, str]]) -> None:
+    """Write a row of ``(char, fg_hex, bg_hex)`` cells to *canvas*.
+
+    Adjacent cells sharing both colours are emitted as one styled segment, so
+    Style/Span allocations scale with colour changes rather than row width.
+    """
+    for (fg_hex, bg_hex), run in groupby(cells, key=itemgetter(1, 2)):
+        canvas.write("".join(cell[0] for cell in run), _cell_style(fg_hex, bg_hex))
+
 
 # Panel widths from tui_styles.tcss
 _LEFT_PANEL_WIDTH = 38
@@ -233,9 +332,10 @@ def screenshot_to_rich_text(
             logger.debug("Screenshot base64 too large (%d bytes), skipping", len(base64_png))
             return None
 
-        image_data = base64.b64decode(base64_png)
+        image_data = _b64decode(base64_png)
+        # Only the header is parsed here; pixel data is decoded on first use so
+        # the block renderer can ask for a reduced-scale decode below.
         img = Image.open(io.BytesIO(image_data))
-        img = img.convert("RGB")
 
         target_w = _get_available_width(max_width)
 
@@ -251,6 +351,7 @@ def screenshot_to_rich_text(
         try:
             from esprit.interface.image_protocol import get_best_image_renderable, PROTOCOL
             if PROTOCOL != "quarter":
+                img = img.convert("RGB")
                 proto_renderable = get_best_image_renderable(img, width=target_w)
                 if proto_renderable is not None:
                     if url_label:
@@ -280,68 +381,91 @@ def screenshot_to_rich_text(
         if new_h % 2 != 0:
             new_h += 1
 
-        # Multi-step downscale for sharper results when shrinking a lot
-        # Halve dimensions progressively until within 2x of target, then final resize
-        step_img = img
-        step_w, step_h = orig_w, orig_h
-        while step_w > new_w * 2.5 and step_h > new_h * 2.5:
-            step_w = step_w // 2
-            step_h = step_h // 2
-            step_img = step_img.resize((step_w, step_h), Image.LANCZOS)
-
-        # Final resize to exact target.
-        # LANCZOS gives the best quality for downscaling.  We intentionally
-        # skip post-resize sharpening: the quarter-block algorithm already
-        # selects the optimal 2-color partition per cell, and sharpening
-        # before that quantisation step creates ringing / halo artefacts
-        # that look much worse than the slight softness it tries to fix.
-        img = step_img.resize((new_w, new_h), Image.LANCZOS)
+        # Let decoders that support it (JPEG) decode straight at a reduced
+        # scale that still leaves 2x headroom over the target.  This is a
+        # no-op for PNG and for images the protocol tier already loaded.
+        img.draft("RGB", (new_w * 2, new_h * 2))
+        if img.mode != "RGB":
+            img = img.convert("RGB")
 
-        pixels = img.load()
-
-        text = Text()
+        canvas = _BlockCanvas()
 
         # Optional URL header
         if url_label:
-            text.append_text(_make_url_header(url_label, target_w, theme_tokens))
-            text.append("\n")
+            canvas.write_text(_make_url_header(url_label, target_w, theme_tokens))
+            canvas.write("\n")
+
+        # Flat-colour images (blank pages, solid panels) skip the resize and
+        # the per-cell work: every cell is the same glyph in the same colour.
+        extrema = img.getextrema()
+        if all(lo == hi for lo, hi in extrema):
+            h = _rgb_hex(tuple(lo for lo, _ in extrema))
+            style = _cell_style(h, h)
+            line = " " * (new_w // 2) if use_quarter else "▀" * new_w
+            for y in range(0, new_h, 2):
+                canvas.write("  ")  # left margin
+                canvas.write(line, style)
+                if y + 2 < new_h:
+                    canvas.write("\n")
+            return canvas.to_text()
+
+        # Resize to exact target.  reducing_gap=2.0 makes Pillow first shrink
+        # by the largest integer factor that keeps the image at least 2x the
+        # target (a single box-filter Image.reduce pass, no intermediate
+        # copies per halving step), then resample the small remainder.
+        # Half-block keeps LANCZOS, the sharpest downscaling filter, since
+        # every output pixel is shown as-is.  Quarter-block averages each
+        # 2x2 partition anyway, which hides the difference, so the cheaper
+        # BILINEAR filter is used there.  We intentionally skip post-resize
+        # sharpening: the quarter-block algorithm already selects the
+        # optimal 2-color partition per cell, and sharpening before that
+        # quantisation step creates ringing / halo artefacts that look much
+        # worse than the slight softness it tries to fix.
+        resample = Image.BILINEAR if use_quarter else Image.LANCZOS
+        img = img.resize((new_w, new_h), resample, reducing_gap=2.0)
+
+        # Copy the pixel buffer out once and split it into rows of RGB tuples;
+        # per-pixel PixelAccess lookups cross into C and allocate every time.
+        channels = iter(img.tobytes())
+        flat = list(zip(channels, channels, channels))
+        rows = [flat[i : i + new_w] for i in range(0, len(flat), new_w)]
 
         # Render pixel grid as block characters
         if use_quarter:
-            # Quarter-block: 2x2 pixel block per terminal cell
+            # Quarter-block: 2x2 pixel block per terminal cell.  Screenshots
+            # repeat the same quads constantly (flat panels, text runs), so
+            # each distinct quad is solved once per image and reused.
+            quad_cache: dict[tuple, tuple[str, str, str]] = {}
+            # new_w and new_h are both even here, so every cell has all four pixels.
             for y in range(0, new_h, 2):
-                text.append("  ")  # left margin
-                for x in range(0, new_w, 2):
-                    tl = pixels[x, y]
-                    tr = pixels[x + 1, y] if x + 1 < new_w else tl
-                    bl = pixels[x, y + 1] if y + 1 < new_h else tl
-                    br = (
-                        pixels[x + 1, y + 1]
-                        if x + 1 < new_w and y + 1 < new_h
-                        else bl
-                    )
-                    ch, fg_hex, bg_hex = _best_quarter_block(tl, tr, bl, br)
-                    text.append(ch, style=Style(color=fg_hex, bgcolor=bg_hex))
+                canvas.write("  ")  # left margin
+                row: list[tuple[str, str, str]] = []
+                top, bot = rows[y], rows[y + 1]
+                for tl, tr, bl, br in zip(top[0::2], top[1::2], bot[0::2], bot[1::2]):
+                    quad = (tl, tr, bl, br)
+                    cell = quad_cache.get(quad)
+                    if cell is None:
+                        cell = quad_cache[quad] = _best_quarter_block(tl, tr, bl, br)
+                    row.append(cell)
+                _write_runs(canvas, row)
                 if y + 2 < new_h:
-                    text.append("\n")
+                    canvas.write("\n")
         else:
-            # Half-block: 1x2 pixel pair per terminal cell
+            # Half-block: 1x2 pixel pair per terminal cell.  Every cell is "▀",
+            # so runs are simply repeated (top, bottom) pixel pairs and only
+            # one colour lookup is needed per run rather than per cell.
             for y in range(0, new_h, 2):
-                text.append("  ")  # left margin
-                for x in range(new_w):
-                    top_r, top_g, top_b = pixels[x, y]
-                    if y + 1 < new_h:
-                        bot_r, bot_g, bot_b = pixels[x, y + 1]
-                    else:
-                        bot_r, bot_g, bot_b = top_r, top_g, top_b
-
-                    fg = f"#{top_r:02x}{top_g:02x}{top_b:02x}"
-                    bg = f"#{bot_r:02x}{bot_g:02x}{bot_b:02x}"
-                    text.append("▀", style=Style(color=fg, bgcolor=bg))
+                canvas.write("  ")  # left margin
+                bot = rows[y + 1] if y + 1 < new_h else rows[y]
+                for (top_px, bot_px), run in groupby(zip(rows[y], bot)):
+                    canvas.write(
+                        "▀" * sum(1 for _ in run),
+                        _cell_style(_rgb_hex(top_px), _rgb_hex(bot_px)),
+                    )
                 if y + 2 < new_h:
-                    text.append("\n")
+                    canvas.write("\n")
 
-        return text
+        return canvas.to_text()
 
     except Exception:
         logger.debug("Failed to render screenshot preview", exc_info=True)
@@ -0,0 +1,28 @@
+"""JSON encode/decode helpers for the small state files under ~/.esprit.
+
+Uses orjson when it is importable (it is pulled in by litellm's proxy extra)
+and falls back to the standard library otherwise. orjson.JSONDecodeError
+subclasses json.JSONDecodeError, so callers keep catching the stdlib error.
+"""
+
+import json
+from typing import Any
+
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - exercised only without orjson installed
+    orjson = None  # type: ignore[assignment]
+
+
+def loads(data: bytes | str) -> Any:
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def dumps_pretty(obj: Any) -> bytes:
+    """Serialize ``obj`` with two-space indentation, as UTF-8 bytes."""
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2)
+    return json.dumps(obj, indent=2).encode("utf-8")
@@ -0,0 +1 @@
+"""Auth tests package."""
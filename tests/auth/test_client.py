@@ -0,0 +1,175 @@
+import base64
+import json
+
+import pytest
+import requests
+
+from esprit.auth import client as auth_client
+from esprit.auth.client import SupabaseAuthClient
+
+
+def _token_for(subject: str) -> str:
+    payload = base64.urlsafe_b64encode(json.dumps({"sub": subject}).encode()).decode()
+    return f"header.{payload.rstrip('=')}.signature"
+
+
+@pytest.fixture
+def saved(monkeypatch):
+    stored = []
+    monkeypatch.setattr(auth_client, "save_credentials", stored.append)
+    return stored
+
+
+def test_complete_login_fetches_profile_for_token_subject(monkeypatch, saved) -> None:
+    client = SupabaseAuthClient()
+    profile_calls = []
+    monkeypatch.setattr(
+        client, "_get_user_info", lambda token: {"id": "user-1", "email": "a@b.c"}
+    )
+
+    def fake_profile(token, user_id):
+        profile_calls.append(user_id)
+        return {"plan": "pro"}
+
+    monkeypatch.setattr(client, "_get_user_profile", fake_profile)
+
+    result = client._complete_login(_token_for("user-1"))
+
+    assert result.success is True
+    assert profile_calls == ["user-1"]
+    assert saved[0]["plan"] == "pro"
+
+
+def test_complete_login_refetches_profile_when_subject_differs(monkeypatch, saved) -> None:
+    client = SupabaseAuthClient()
+    profile_calls = []
+    monkeypatch.setattr(client, "_get_user_info", lambda token: {"id": "user-2"})
+
+    def fake_profile(token, user_id):
+        profile_calls.append(user_id)
+        return {"plan": "team"} if user_id == "user-2" else None
+
+    monkeypatch.setattr(client, "_get_user_profile", fake_profile)
+
+    result = client._complete_login("not-a-jwt")
+
+    assert result.success is True
+    assert profile_calls == ["user-2"]
+    assert saved[0]["plan"] == "team"
+
+
+class _FakeResponse:
+    def __init__(self, status_code, payload):
+        self.status_code = status_code
+        self._payload = payload
+
+    def json(self):
+        return self._payload
+
+
+def test_poll_device_token_backs_off_on_slow_down(monkeypatch) -> None:
+    client = SupabaseAuthClient()
+    responses = iter(
+        [
+            _FakeResponse(400, {"detail": {"error": "authorization_pending"}}),
+            _FakeResponse(400, {"detail": {"error": "slow_down"}}),
+            _FakeResponse(200, {"access_token": "tok"}),
+        ]
+    )
+    sleeps = []
+    monkeypatch.setattr(client._session, "post", lambda *a, **kw: next(responses))
+    monkeypatch.setattr(client._cancel, "wait", lambda timeout: sleeps.append(timeout) or False)
+    monkeypatch.setattr(auth_client.random, "uniform", lambda a, b: 0.0)
+
+    assert client._poll_device_token("code", expires_in=600, interval=5) == {
+        "access_token": "tok"
+    }
+    assert sleeps == pytest.approx([6.0, 6.0, 8.4])
+
+
+def test_poll_device_token_reports_expired_code(monkeypatch) -> None:
+    client = SupabaseAuthClient()
+    monkeypatch.setattr(
+        client._session,
+        "post",
+        lambda *a, **kw: _FakeResponse(400, {"detail": {"error": "expired_token"}}),
+    )
+    monkeypatch.setattr(client._cancel, "wait", lambda timeout: False)
+
+    result = client._poll_device_token("code", expires_in=600, interval=5)
+
+    assert result.success is False
+    assert result.error == "Code expired. Please try again."
+
+
+def test_poll_device_token_stops_when_cancelled(monkeypatch) -> None:
+    client = SupabaseAuthClient()
+    monkeypatch.setattr(
+        client._session, "post", lambda *a, **kw: pytest.fail("polled after cancel")
+    )
+    client.cancel()
+
+    result = client._poll_device_token("code", expires_in=600, interval=5)
+
+    assert result.success is False
+    assert result.error == "Cancelled"
+
+
+def test_supabase_headers_are_not_sent_to_device_flow_endpoints() -> None:
+    client = SupabaseAuthClient(supabase_key="anon-key")
+
+    device = client._session.prepare_request(
+        requests.Request("POST", f"{client.api_base_url}/auth/device/code", json={})
+    )
+    assert "apikey" not in device.headers
+    assert "Authorization" not in device.headers
+
+    supabase = client._session.prepare_request(
+        requests.Request("GET", f"{client.supabase_url}/auth/v1/user", auth=client._auth("tok"))
+    )
+    assert supabase.headers["apikey"] == "anon-key"
+    assert supabase.headers["Authorization"] == "Bearer tok"
+    assert supabase.headers["Content-Type"] == "application/json"
+
+
+def test_sigint_handler_restored_when_previous_was_not_set_from_python(monkeypatch) -> None:
+    client = SupabaseAuthClient()
+    calls = []
+
+    def fake_signal(signum, handler):
+        calls.append(handler)
+        return None  # previous handler installed outside Python
+
+    monkeypatch.setattr(auth_client.signal, "signal", fake_signal)
+
+    with client._sigint_cancels():
+        on_sigint = calls[0]
+        on_sigint(auth_client.signal.SIGINT, None)
+        assert client._cancel.is_set()
+        with pytest.raises(KeyboardInterrupt):
+            on_sigint(auth_client.signal.SIGINT, None)
+
+    assert calls[-1] is auth_client.signal.default_int_handler
+
+
+def test_poll_device_token_stops_after_cancel_during_request(monkeypatch) -> None:
+    client = SupabaseAuthClient()
+    monkeypatch.setattr(client._cancel, "wait", lambda timeout: False)
+
+    class Pending:
+        status_code = 400
+
+        def json(self):
+            return {"detail": "authorization_pending"}
+
+    def post(*args, **kwargs):
+        assert kwargs["timeout"] == auth_client._POLL_REQUEST_TIMEOUT_SECONDS
+        client.cancel()
+        return Pending()
+
+    monkeypatch.setattr(client._session, "post", post)
+
+    result = client._poll_device_token("code", expires_in=600, interval=5)
+
+    assert result.success is False
+    assert result.error == "Cancelled"
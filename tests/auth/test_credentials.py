@@ -0,0 +1,163 @@
+import json
+import os
+
+import pytest
+
+from esprit.auth import credentials
+
+
+@pytest.fixture
+def creds_path(monkeypatch, tmp_path):
+    path = tmp_path / "credentials.json"
+    monkeypatch.setattr(credentials, "get_credentials_path", lambda: path)
+    monkeypatch.setattr(credentials, "_CREDS_CACHE", None)
+    return path
+
+
+def test_get_credentials_reuses_parse_while_file_unchanged(monkeypatch, creds_path) -> None:
+    creds_path.write_text(json.dumps({"access_token": "tok", "plan": "pro"}), encoding="utf-8")
+    calls = []
+    real_loads = credentials.json_io.loads
+
+    def counting_loads(data):
+        calls.append(data)
+        return real_loads(data)
+
+    monkeypatch.setattr(credentials.json_io, "loads", counting_loads)
+
+    assert credentials.get_credentials() == {"access_token": "tok", "plan": "pro"}
+    assert credentials.get_credentials() == {"access_token": "tok", "plan": "pro"}
+    assert len(calls) == 1
+
+
+def test_get_credentials_rereads_after_file_changes(creds_path) -> None:
+    creds_path.write_text(json.dumps({"access_token": "old"}), encoding="utf-8")
+    assert credentials.get_credentials() == {"access_token": "old"}
+
+    creds_path.write_text(json.dumps({"access_token": "newer"}), encoding="utf-8")
+    st = creds_path.stat()
+    os.utime(creds_path, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000))
+
+    assert credentials.get_credentials() == {"access_token": "newer"}
+
+
+def test_save_and_clear_invalidate_cache(creds_path) -> None:
+    credentials.save_credentials({"access_token": "tok", "plan": "free"})
+    assert credentials.get_credentials() == {"access_token": "tok", "plan": "free"}
+
+    credentials.clear_credentials()
+    assert credentials.get_credentials() is None
+
+
+@pytest.fixture
+def fresh_verification_cache(monkeypatch):
+    monkeypatch.setattr(
+        credentials,
+        "_verification_cache",
+        {"token": None, "checked_at": 0.0, "result": None, "refreshing": False},
+    )
+    return credentials._verification_cache
+
+
+def test_verify_subscription_serves_soft_stale_entry_and_refreshes(
+    monkeypatch, fresh_verification_cache
+) -> None:
+    stale = {"valid": True, "plan": "pro"}
+    fresh = {"valid": True, "plan": "team"}
+    fresh_verification_cache.update(
+        token="tok",
+        checked_at=credentials.time.time() - credentials._VERIFICATION_SOFT_TTL_SECONDS - 1,
+        result=stale,
+    )
+    started = []
+
+    class ImmediateThread:
+        def __init__(self, target, args, daemon):
+            self._target = target
+            self._args = args
+
+        def start(self):
+            started.append(self._args)
+            self._target(*self._args)
+
+    monkeypatch.setattr(credentials.threading, "Thread", ImmediateThread)
+    monkeypatch.setattr(credentials, "_fetch_subscription", lambda token: fresh)
+
+    assert credentials.verify_subscription("tok") is stale
+    assert started == [("tok",)]
+    assert credentials.verify_subscription("tok") is fresh
+    assert fresh_verification_cache["refreshing"] is False
+
+
+def test_background_refresh_failure_keeps_entry_and_clears_flag(
+    monkeypatch, fresh_verification_cache
+) -> None:
+    stale = {"valid": True, "plan": "pro"}
+    checked_at = credentials.time.time() - credentials._VERIFICATION_SOFT_TTL_SECONDS - 1
+    fresh_verification_cache.update(token="tok", checked_at=checked_at, result=stale)
+
+    def failing_fetch(token):
+        raise AttributeError("'list' object has no attribute 'get'")
+
+    monkeypatch.setattr(credentials, "_fetch_subscription", failing_fetch)
+
+    credentials._refresh_subscription("tok")
+
+    assert fresh_verification_cache["refreshing"] is False
+    assert fresh_verification_cache["result"] is stale
+    assert fresh_verification_cache["checked_at"] == checked_at
+
+
+def test_verify_subscription_blocks_when_expired(monkeypatch, fresh_verification_cache) -> None:
+    fresh_verification_cache.update(
+        token="tok",
+        checked_at=credentials.time.time() - credentials._VERIFICATION_CACHE_TTL_SECONDS - 1,
+        result={"valid": False},
+    )
+    monkeypatch.setattr(credentials, "_fetch_subscription", lambda token: {"valid": True})
+
+    assert credentials.verify_subscription("tok") == {"valid": True}
+
+
+def test_invalidate_subscription_cache_only_for_matching_token(fresh_verification_cache) -> None:
+    fresh_verification_cache.update(token="tok", checked_at=1.0, result={"valid": True})
+
+    credentials.invalidate_subscription_cache("other")
+    assert fresh_verification_cache["token"] == "tok"
+
+    credentials.invalidate_subscription_cache("tok")
+    assert fresh_verification_cache["result"] is None
+
+
+def test_is_authenticated_checks_expiry_against_epoch(creds_path) -> None:
+    now = int(credentials.time.time())
+    credentials.save_credentials({"access_token": "tok", "expires_at": now + 3600})
+    assert credentials.is_authenticated() is True
+    assert credentials.get_auth_token() == "tok"
+
+    credentials.save_credentials({"access_token": "tok", "expires_at": now - 1})
+    assert credentials.is_authenticated() is False
+    assert credentials.get_auth_token() is None
+
+
+def test_save_credentials_is_atomic_and_owner_only(creds_path) -> None:
+    credentials.save_credentials({"access_token": "tok"})
+
+    assert [p.name for p in creds_path.parent.iterdir()] == ["credentials.json"]
+    if os.name != "nt":
+        assert creds_path.stat().st_mode & 0o777 == 0o600
+
+
+def test_save_credentials_writes_through_symlink(tmp_path, creds_path) -> None:
+    dotfiles = tmp_path / "dotfiles"
+    dotfiles.mkdir()
+    real_file = dotfiles / "credentials.json"
+    real_file.write_text("{}", encoding="utf-8")
+    creds_path.symlink_to(real_file)
+
+    credentials.save_credentials({"access_token": "tok"})
+
+    assert creds_path.is_symlink()
+    assert json.loads(real_file.read_text(encoding="utf-8")) == {"access_token": "tok"}
+    assert [p.name for p in dotfiles.iterdir()] == ["credentials.json"]
+    assert credentials.get_credentials() == {"access_token": "tok"}
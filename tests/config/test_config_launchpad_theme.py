@@ -1,12 +1,17 @@
 import json
+import os
+
+import pytest
 
 from esprit.config import Config
+from esprit.utils import json_io
 
 
 def _configure_temp_config_dir(monkeypatch, tmp_path):
     config_root = tmp_path / ".esprit"
     monkeypatch.setattr(Config, "config_dir", classmethod(lambda _cls: config_root))
     monkeypatch.setattr(Config, "_config_file_override", None)
+    Config.invalidate_cache()
     return config_root
 
 
@@ -88,3 +93,138 @@ def test_save_current_persists_cloud_fallback_override(monkeypatch, tmp_path) ->
     config_file = config_root / "cli-config.json"
     saved = json.loads(config_file.read_text(encoding="utf-8"))
     assert saved["env"]["ESPRIT_CLOUD_MODEL_FALLBACK"] == "false"
+
+
+def test_tracked_vars_are_cached_public_string_settings() -> None:
+    tracked = Config.tracked_vars()
+
+    assert "ESPRIT_LLM" in tracked
+    assert "LLM_TIMEOUT" in tracked
+    assert all(not name.startswith("_") for name in tracked)
+    assert frozenset(tracked) == Config._TRACKED_UPPER_SET
+    assert Config._llm_env_vars() <= Config._TRACKED_UPPER_SET
+
+
+def test_load_reuses_parse_until_file_changes(monkeypatch, tmp_path) -> None:
+    config_root = _configure_temp_config_dir(monkeypatch, tmp_path)
+    assert Config.save_launchpad_theme("matrix") is True
+
+    calls = []
+    real_loads = json_io.loads
+    monkeypatch.setattr(json_io, "loads", lambda data: calls.append(data) or real_loads(data))
+
+    first = Config.load()
+    first["ui"]["launchpad_theme"] = "mutated"
+    assert Config.load()["ui"]["launchpad_theme"] == "matrix"
+    assert calls == []
+
+    (config_root / "cli-config.json").write_text(
+        json.dumps({"ui": {"launchpad_theme": "ember-glow"}}), encoding="utf-8"
+    )
+    assert Config.get_launchpad_theme() == "ember-glow"
+    assert len(calls) == 1
+
+
+def test_save_writes_owner_only_file_without_leftovers(monkeypatch, tmp_path) -> None:
+    config_root = _configure_temp_config_dir(monkeypatch, tmp_path)
+
+    assert Config.save({"ui": {"launchpad_theme": "matrix"}}) is True
+
+    config_file = config_root / "cli-config.json"
+    assert [p.name for p in config_root.iterdir()] == ["cli-config.json"]
+    if os.name != "nt":
+        assert config_file.stat().st_mode & 0o777 == 0o600
+
+
+def test_save_writes_through_symlinked_config(monkeypatch, tmp_path) -> None:
+    config_root = _configure_temp_config_dir(monkeypatch, tmp_path)
+    dotfiles = tmp_path / "dotfiles"
+    dotfiles.mkdir()
+    real_file = dotfiles / "cli-config.json"
+    real_file.write_text("{}", encoding="utf-8")
+    config_root.mkdir()
+    link = config_root / "cli-config.json"
+    link.symlink_to(real_file)
+
+    assert Config.save({"ui": {"launchpad_theme": "matrix"}}) is True
+
+    assert link.is_symlink()
+    assert json.loads(real_file.read_text(encoding="utf-8")) == {
+        "ui": {"launchpad_theme": "matrix"}
+    }
+    assert sorted(p.name for p in dotfiles.iterdir()) == ["cli-config.json"]
+    assert Config.get_launchpad_theme() == "matrix"
+
+
+def test_apply_saved_writes_once_when_clearing_and_llm_change(monkeypatch, tmp_path) -> None:
+    config_root = _configure_temp_config_dir(monkeypatch, tmp_path)
+    config_root.mkdir(parents=True, exist_ok=True)
+    (config_root / "cli-config.json").write_text(
+        json.dumps(
+            {
+                "env": {
+                    "ESPRIT_LLM": "openai/gpt-5",
+                    "PERPLEXITY_API_KEY": "pplx",
+                    "LLM_TIMEOUT": "9",
+                }
+            }
+        ),
+        encoding="utf-8",
+    )
+    monkeypatch.setenv("PERPLEXITY_API_KEY", "")
+    monkeypatch.setenv("ESPRIT_LLM", "anthropic/claude")
+    saves = []
+    real_save = Config.save.__func__
+    monkeypatch.setattr(
+        Config, "save", classmethod(lambda cls, cfg: saves.append(cfg) or real_save(cls, cfg))
+    )
+
+    Config.apply_saved()
+
+    assert len(saves) == 1
+    assert saves[0]["env"] == {}
+
+
+def test_apply_saved_skips_write_when_nothing_changed(monkeypatch, tmp_path) -> None:
+    config_root = _configure_temp_config_dir(monkeypatch, tmp_path)
+    config_root.mkdir(parents=True, exist_ok=True)
+    (config_root / "cli-config.json").write_text(
+        json.dumps({"env": {"PERPLEXITY_API_KEY": "pplx"}}), encoding="utf-8"
+    )
+    monkeypatch.delenv("PERPLEXITY_API_KEY", raising=False)
+    monkeypatch.setenv("ESPRIT_LLM", "")
+    monkeypatch.setattr(
+        Config, "save", classmethod(lambda cls, cfg: pytest.fail("unexpected save"))
+    )
+
+    assert Config.apply_saved() == {"PERPLEXITY_API_KEY": "pplx"}
+
+
+def test_save_skips_write_when_payload_matches_disk(monkeypatch, tmp_path) -> None:
+    config_root = _configure_temp_config_dir(monkeypatch, tmp_path)
+    assert Config.save({"ui": {"launchpad_theme": "matrix"}}) is True
+    config_file = config_root / "cli-config.json"
+    before = config_file.stat().st_mtime_ns
+
+    monkeypatch.setattr(
+        "esprit.config.config.tempfile.mkstemp", lambda **kw: pytest.fail("rewrote file")
+    )
+
+    assert Config.save({"ui": {"launchpad_theme": "matrix"}}) is True
+    assert config_file.stat().st_mtime_ns == before
+
+
+def test_save_current_skips_save_when_env_unchanged(monkeypatch, tmp_path) -> None:
+    config_root = _configure_temp_config_dir(monkeypatch, tmp_path)
+    config_root.mkdir(parents=True, exist_ok=True)
+    (config_root / "cli-config.json").write_text(
+        json.dumps({"env": {"ESPRIT_LLM": "openai/gpt-5"}}), encoding="utf-8"
+    )
+    for var_name in Config.tracked_vars():
+        monkeypatch.delenv(var_name, raising=False)
+    monkeypatch.setenv("ESPRIT_LLM", "openai/gpt-5")
+    monkeypatch.setattr(
+        Config, "save", classmethod(lambda cls, cfg: pytest.fail("unexpected save"))
+    )
+
+    assert Config.save_current() is True
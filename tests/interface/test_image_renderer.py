@@ -9,6 +9,7 @@ import pytest
 from rich.text import Text
 
 from esprit.interface.image_renderer import (
+    _QUARTER_BLOCKS,
     _avg_color,
     _best_quarter_block,
     _color_dist_sq,
@@ -117,6 +118,46 @@ class TestBestQuarterBlock:
         assert ch in ("▘", "▟")
         assert {fg, bg} == {"#ffffff", "#000000"}
 
+    def test_two_color_diagonal_split(self) -> None:
+        """Diagonal two-tone quad → ▚ or ▞ with exact colours."""
+        a = (10, 20, 30)
+        b = (200, 210, 220)
+        ch, fg, bg = _best_quarter_block(a, b, b, a)
+        assert ch in ("▚", "▞")
+        assert {fg, bg} == {"#0a141e", "#c8d2dc"}
+
+    def test_matches_exhaustive_search(self) -> None:
+        """Pruned search still finds a partition as good as all 16 masks."""
+        import random
+
+        def err_of(quad, ch, fg, bg):
+            fg_c = tuple(int(fg[i : i + 2], 16) for i in (1, 3, 5))
+            bg_c = tuple(int(bg[i : i + 2], 16) for i in (1, 3, 5))
+            bits = _QUARTER_BLOCKS.index(ch)
+            return sum(
+                _color_dist_sq(quad[j], fg_c if bits & (1 << (3 - j)) else bg_c)
+                for j in range(4)
+            )
+
+        def exhaustive(quad):
+            best = None
+            for bits in range(16):
+                fg = [quad[j] for j in range(4) if bits & (1 << (3 - j))]
+                bg = [quad[j] for j in range(4) if not bits & (1 << (3 - j))]
+                fg_c, bg_c = _avg_color(fg), _avg_color(bg)
+                err = sum(
+                    _color_dist_sq(quad[j], fg_c if bits & (1 << (3 - j)) else bg_c)
+                    for j in range(4)
+                )
+                best = err if best is None else min(best, err)
+            return best
+
+        rng = random.Random(1234)
+        for _ in range(500):
+            quad = tuple(tuple(rng.randrange(256) for _ in range(3)) for _ in range(4))
+            ch, fg, bg = _best_quarter_block(*quad)
+            assert err_of(quad, ch, fg, bg) == exhaustive(quad)
+
     def test_returns_three_strings(self) -> None:
         result = _best_quarter_block((0, 0, 0), (255, 255, 255), (0, 0, 0), (255, 255, 255))
         assert len(result) == 3
@@ -156,6 +197,21 @@ class TestQuarterBlockRendering:
         result = screenshot_to_rich_text(b64, max_width=10)
         assert result is not None
 
+    def test_large_jpeg_renders_at_target_size(self) -> None:
+        """JPEG payloads go through a reduced-scale draft decode."""
+        from PIL import Image
+
+        img = Image.new("RGB", (1920, 1080), (20, 20, 20))
+        for x in range(0, 1920, 96):
+            img.paste((230, 230, 230), (x, 0, x + 48, 1080))
+        buf = io.BytesIO()
+        img.save(buf, format="JPEG")
+        b64 = base64.b64encode(buf.getvalue()).decode("ascii")
+
+        result = screenshot_to_rich_text(b64, max_width=20, mode="quarter")
+        assert isinstance(result, Text)
+        assert all(len(line) == 22 for line in result.plain.split("\n"))
+
 
 class TestHalfBlockRendering:
     def test_half_mode_produces_text(self) -> None:
@@ -170,3 +226,13 @@ class TestHalfBlockRendering:
         result = screenshot_to_rich_text(b64, max_width=10, mode="half")
         assert result is not None
         assert "▀" in result.plain
+
+    def test_flat_image_renders_one_run_per_row(self) -> None:
+        """A uniform image short-circuits to one styled run per row."""
+        b64 = _make_solid_png_b64((12, 34, 56), size=(64, 48))
+        result = screenshot_to_rich_text(b64, max_width=10, mode="half")
+        assert isinstance(result, Text)
+        lines = result.plain.split("\n")
+        assert all(line == "  " + "▀" * 10 for line in lines)
+        assert len(result.spans) == len(lines)
+        assert {str(span.style) for span in result.spans} == {"#0c2238 on #0c2238"}